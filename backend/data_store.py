@@ -0,0 +1,62 @@
+import os
+import pandas as pd
+import pyarrow as pa
+from typing import Optional, Tuple
+
+# Arrow IPC file holding the loaded OHLCV data, shared between worker processes (and
+# kept across restarts). Only used when ALPHAFLOW_DATA_PATH is set; otherwise each
+# process keeps its uploads in memory and never touches the store.
+DATA_PATH = os.environ.get('ALPHAFLOW_DATA_PATH')
+SHARED_STORE = DATA_PATH is not None
+
+def write_ohlcv(df: pd.DataFrame, path: str = DATA_PATH) -> Tuple[int, int]:
+    """
+    Writes the DataFrame to an Arrow IPC file, atomically replacing any previous data.
+    Args:
+        df (pd.DataFrame): The validated OHLCV DataFrame.
+        path (str): Destination file.
+    Returns:
+        Tuple[int, int]: data_version() of the file written here, taken before it is
+        moved into place so a concurrent upload can't be mistaken for this one.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        st = os.stat(tmp_path)
+        # Readers holding the old mapping keep it; new readers see the new file
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave a partial file behind
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return st.st_ino, st.st_mtime_ns
+
+def data_version(path: str = DATA_PATH) -> Optional[Tuple[int, int]]:
+    """
+    Identifies the stored data; changes whenever write_ohlcv replaces the file.
+    Returns:
+        Optional[Tuple[int, int]]: (inode, mtime_ns), or None if nothing has been stored.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns
+
+def read_ohlcv(path: str = DATA_PATH) -> pd.DataFrame:
+    """
+    Reads the stored data through a memory map. Columns are converted without
+    consolidating blocks, so null-free numeric and timestamp columns stay views of
+    the mapped pages, which the OS shares between worker processes.
+    Returns:
+        pd.DataFrame: The stored OHLCV DataFrame.
+    """
+    with pa.memory_map(path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
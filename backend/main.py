@@ -1,35 +1,67 @@
 import sys
 import os
+from collections import OrderedDict
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from fastapi import FastAPI, UploadFile, HTTPException, Body
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import FastAPI, UploadFile, HTTPException, Body, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import numpy as np
+import orjson
 import pandas as pd
-from typing import Dict, List
+from typing import Dict, Iterator, List, Literal, Tuple
 from data_loader import read_csv_to_dataframe
+from data_store import SHARED_STORE, data_version, read_ohlcv, write_ohlcv
+from middleware import StaticCORSMiddleware
 from model.ohlcv_model import OHLCV
 from pydantic import BaseModel, Field
 from backend.strategy import indicators as ind
 from backend.strategy.executor import execute_strategy
-from backend.strategy.logic_builder import evaluate_logic
+from backend.strategy.ohlcv_arrays import OHLCVArrays
+from backend.strategy.logic_builder import compile_logic
 import logging
 
-app = FastAPI(title="AlphaFlow API")
+app = FastAPI(title="AlphaFlow API", default_response_class=ORJSONResponse)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Add CORS middleware (any origin, method and header, with credentials)
+app.add_middleware(StaticCORSMiddleware)
 
-# In-memory storage for OHLCV data
+# The loaded OHLCV data. With a shared Arrow store (see data_store) this is this
+# worker's view of it, refreshed by _current_data() whenever any worker uploads new data
 ohlcv_data: pd.DataFrame | None = None
+# The same data as plain numpy columns, for the indicator and executor kernels
+ohlcv_arrays: OHLCVArrays | None = None
+_loaded_version: tuple | None = None
+
+# Indicator outputs computed on the loaded data, keyed on (name, price_col, params),
+# least recently used first. Cleared whenever ohlcv_data is replaced.
+INDICATOR_CACHE_SIZE = 32
+_indicator_cache: 'OrderedDict[tuple, Tuple[np.ndarray, ...]]' = OrderedDict()
+
+# name -> (array function, ((output param, default column name), ...))
+INDICATORS = {
+    'ema': (ind.ema, (('out_col', 'ema'),)),
+    'rsi': (ind.rsi, (('out_col', 'rsi'),)),
+    'macd': (ind.macd, (('macd_col', 'macd'), ('signal_col', 'macd_signal'))),
+}
+
+def _current_data() -> pd.DataFrame | None:
+    """Return the loaded OHLCV data, re-reading the store if another worker replaced it"""
+    global ohlcv_data, ohlcv_arrays, _loaded_version
+    if not SHARED_STORE:
+        return ohlcv_data
+    version = data_version()
+    if version != _loaded_version:
+        if version is None:
+            ohlcv_data = ohlcv_arrays = None
+        else:
+            ohlcv_data = read_ohlcv()
+            ohlcv_arrays = OHLCVArrays.from_dataframe(ohlcv_data)
+        _loaded_version = version
+        _indicator_cache.clear()
+    return ohlcv_data
 
 @app.get("/health")
 async def health_check() -> Dict[str, str]:
@@ -39,28 +71,22 @@ async def health_check() -> Dict[str, str]:
 @app.post("/load-data")
 async def load_data(file: UploadFile) -> Dict[str, str]:
     """Load OHLCV data from CSV file"""
-    global ohlcv_data
+    global ohlcv_data, ohlcv_arrays, _loaded_version
     
     if not file.filename.endswith('.csv'):
         logger.error(f"File upload failed: {file.filename} is not a CSV.")
         raise HTTPException(status_code=400, detail="File must be a CSV")
     
     try:
-        # Use the data_loader function to parse the CSV and handle timestamp
-        # Await file.read() to get the content, then wrap in UploadFile-like object
-        class AsyncUploadFile:
-            def __init__(self, filename, content):
-                self.filename = filename
-                from io import BytesIO
-                self.file = BytesIO(content)
-        
-        content = await file.read()
-        sync_file = AsyncUploadFile(file.filename, content)
-        ohlcv_data = read_csv_to_dataframe(sync_file)
+        # Parse straight from the spooled upload file; no intermediate copy of the content
+        await file.seek(0)
+        data = read_csv_to_dataframe(file)
         
         # Validate required columns
         required_columns = ['open', 'high', 'low', 'close', 'volume']
-        missing_columns = [col for col in required_columns if col not in ohlcv_data.columns.str.lower()]
+        lower_columns = [col.lower() for col in data.columns]
+        present_columns = set(lower_columns)
+        missing_columns = [col for col in required_columns if col not in present_columns]
         
         if missing_columns:
             logger.error(f"Missing required columns: {missing_columns}")
@@ -70,7 +96,14 @@ async def load_data(file: UploadFile) -> Dict[str, str]:
             )
         
         # Standardize column names to lowercase
-        ohlcv_data.columns = ohlcv_data.columns.str.lower()
+        data.columns = lower_columns
+        
+        # Only replace the stored data (and its derived state) once the upload is valid
+        if SHARED_STORE:
+            _loaded_version = write_ohlcv(data)
+        ohlcv_data = data
+        ohlcv_arrays = OHLCVArrays.from_dataframe(data)
+        _indicator_cache.clear()
         
         logger.info(f"Data loaded successfully from {file.filename}.")
         return {"message": "Data loaded successfully"}
@@ -79,20 +112,54 @@ async def load_data(file: UploadFile) -> Dict[str, str]:
         logger.exception(f"Error loading data: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.get("/get-data", response_model=Dict[str, List[OHLCV]])
-async def get_data() -> Dict[str, List[OHLCV]]:
-    """Retrieve loaded OHLCV data as a list of OHLCV models"""
-    if ohlcv_data is None:
+# Rows encoded per chunk when streaming /get-data; bounds the Python objects alive at once
+GET_DATA_BATCH_ROWS = 50_000
+
+def _column_values(series: pd.Series):
+    """A column as orjson input: numeric columns stay numpy, so float32 cells encode as float32"""
+    if series.dtype.kind in 'biuf':
+        return np.ascontiguousarray(series.to_numpy())
+    return series.astype(str).tolist()
+
+def _encode_record_batch(batch: pd.DataFrame) -> bytes:
+    """orjson-encode a slice of rows, without the enclosing list brackets"""
+    cols = batch.columns.tolist()
+    # Rows of numpy scalars, encoded by orjson itself exactly as in the columns orient
+    values = [_column_values(batch[col]) for col in cols]
+    rows = [dict(zip(cols, row)) for row in zip(*values)]
+    # Strip the list brackets so batches join into one JSON array
+    return orjson.dumps(rows, option=orjson.OPT_SERIALIZE_NUMPY)[1:-1]
+
+def _iter_record_batches(df: pd.DataFrame, first: bytes) -> Iterator[bytes]:
+    """Yield the {"data": [...]} records payload: the pre-encoded head, then the remaining batches"""
+    yield first
+    for start in range(GET_DATA_BATCH_ROWS, len(df), GET_DATA_BATCH_ROWS):
+        yield b',' + _encode_record_batch(df.iloc[start:start + GET_DATA_BATCH_ROWS])
+    yield b']}'
+
+def _columns_payload(df: pd.DataFrame) -> Dict[str, list]:
+    """Column-oriented payload: numeric columns go to orjson as raw numpy arrays"""
+    cols = df.columns.tolist()
+    return {"columns": cols, "data": [_column_values(df[col]) for col in cols]}
+
+@app.get("/get-data", response_model=None, responses={200: {"model": Dict[str, List[OHLCV]]}})
+async def get_data(
+    orient: Literal['records', 'columns'] = Query('records', description="'records' streams a list of OHLCV rows; 'columns' returns {columns, data} with one array per column")
+):
+    """Retrieve loaded OHLCV data as a list of OHLCV records, or column-wise"""
+    if _current_data() is None:
         logger.error("No data has been loaded when calling /get-data.")
         raise HTTPException(status_code=404, detail="No data has been loaded")
     
     try:
-        df = ohlcv_data.copy()
-        if 'timestamp' in df.columns:
-            df['timestamp'] = df['timestamp'].astype(str)
-        data = [OHLCV(**row) for row in df.to_dict(orient='records')]
-        logger.info(f"Returned {len(data)} OHLCV records.")
-        return {"data": data}
+        # The frame was validated on load, so skip per-row model validation and serialize directly
+        logger.info(f"Returning {len(ohlcv_data)} OHLCV records ({orient}).")
+        if orient == 'columns':
+            return ORJSONResponse(_columns_payload(ohlcv_data))
+        # Encode the first batch before the 200 goes out, so serialization errors still
+        # surface as a 500; a failure in a later batch can only truncate the stream
+        first = b'{"data":[' + _encode_record_batch(ohlcv_data.iloc[:GET_DATA_BATCH_ROWS])
+        return StreamingResponse(_iter_record_batches(ohlcv_data, first), media_type="application/json")
     
     except Exception as e:
         logger.exception(f"Error returning data: {e}")
@@ -103,55 +170,81 @@ class StrategyRequest(BaseModel):
     logic: dict = Field(..., description="Logic rules with 'entry', 'exit', and 'conditions' list")
     execution: dict = Field(..., description="Execution params: order_type, stop_loss, take_profit, etc.")
 
+def _apply_indicator(df: pd.DataFrame, name: str, params: dict) -> None:
+    """Add an indicator's output columns to df, reusing cached results for raw data columns"""
+    if name not in INDICATORS:
+        # Add more indicators as needed
+        return
+    compute, outputs = INDICATORS[name]
+    params = dict(params)
+    price_col = params.pop('price_col', 'close')
+    out_cols = [params.pop(key, default) for key, default in outputs]
+    # Only columns of the loaded data are safe to key on; derived columns may
+    # be redefined by other indicators from one request to the next
+    cacheable = price_col in ohlcv_data.columns
+    key = (name, price_col, tuple(sorted(params.items())))
+    arrays = _indicator_cache.get(key) if cacheable else None
+    if arrays is not None:
+        _indicator_cache.move_to_end(key)
+    else:
+        price = ohlcv_arrays[price_col] if price_col in ohlcv_arrays else df[price_col].to_numpy()
+        arrays = compute(price, **params)
+        if not isinstance(arrays, tuple):
+            arrays = (arrays,)
+        if cacheable:
+            _indicator_cache[key] = arrays
+            if len(_indicator_cache) > INDICATOR_CACHE_SIZE:
+                _indicator_cache.popitem(last=False)
+    for col, arr in zip(out_cols, arrays):
+        df[col] = arr
+
 @app.post("/run-strategy")
 async def run_strategy(req: StrategyRequest = Body(...)):
-    global ohlcv_data
-    if ohlcv_data is None:
+    if _current_data() is None:
         raise HTTPException(status_code=400, detail="No data loaded. Upload data first.")
     df = ohlcv_data.copy()
     # Apply indicators
     for ind_cfg in req.indicators:
-        name = ind_cfg['name'].lower()
-        params = ind_cfg.get('params', {})
-        if name == 'ema':
-            df = ind.add_ema(df, **params)
-        elif name == 'rsi':
-            df = ind.add_rsi(df, **params)
-        elif name == 'macd':
-            df = ind.add_macd(df, **params)
-        # Add more indicators as needed
+        _apply_indicator(df, ind_cfg['name'].lower(), ind_cfg.get('params', {}))
     # Evaluate logic
-    conditions = req.logic['conditions']
-    entry_logic = req.logic['entry']
-    exit_logic = req.logic['exit']
-    entry_signal = evaluate_logic(df, conditions, entry_logic)
-    exit_signal = evaluate_logic(df, conditions, exit_logic)
+    # Compiled rules are cached, so re-running a strategy skips parsing and compilation
+    conditions = tuple(req.logic['conditions'])
+    try:
+        entry_rule = compile_logic(conditions, req.logic['entry'])
+        exit_rule = compile_logic(conditions, req.logic['exit'])
+        entry_signal = entry_rule(df)
+        exit_signal = exit_rule(df)
+    except (ValueError, TypeError, KeyError, NameError, SyntaxError) as e:
+        logger.error(f"Invalid strategy logic: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid strategy logic: {e}")
     # Execution params
     order_type = req.execution.get('order_type', 'market')
     stop_loss = req.execution.get('stop_loss')
     take_profit = req.execution.get('take_profit')
     # Run strategy
     result = execute_strategy(
-        df,
+        ohlcv_arrays,
         entry_signal,
         exit_signal,
         order_type=order_type,
         initial_balance=req.execution.get('initial_balance', 10000.0),
         position_size=req.execution.get('position_size', 1.0)
     )
-    # Calculate Sharpe ratio
-    returns = pd.Series(result['trades']).apply(lambda t: t.get('pnl', 0))
-    if len(returns) > 1 and returns.std() != 0:
-        sharpe = (returns.mean() / returns.std()) * (252 ** 0.5)
+    summary = result['summary']
+    # Calculate Sharpe ratio over closed-trade PnL
+    pnls = np.fromiter((t['pnl'] for t in result['trades'] if t['type'] == 'exit'), dtype=np.float64)
+    pnl_std = pnls.std(ddof=1) if pnls.size > 1 else 0.0
+    if pnl_std != 0:
+        sharpe = (pnls.mean() / pnl_std) * (252 ** 0.5)
     else:
         sharpe = 0.0
     return {
         'trades': result['trades'],
         'metrics': {
-            'total_pnl': result['total_pnl'],
-            'max_drawdown': result['max_drawdown'],
-            'final_balance': result['final_balance'],
-            'total_trades': result['total_trades'],
+            'total_pnl': summary['total_pnl'],
+            'max_drawdown': summary['max_drawdown_$'],
+            'final_balance': summary['final_balance'],
+            'total_trades': summary['total_trades'],
             'sharpe_ratio': sharpe
         }
     }
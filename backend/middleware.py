@@ -0,0 +1,55 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ALL_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+
+class StaticCORSMiddleware:
+    """
+    Minimal CORS for a wide-open API: any origin, method and header, with credentials.
+    Equivalent to CORSMiddleware(allow_origins=["*"], allow_credentials=True,
+    allow_methods=["*"], allow_headers=["*"]) but with no per-request policy checks:
+    the origin is echoed back (browsers reject '*' on credentialed requests) and
+    everything else is a precomputed header block.
+    """
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        origin = None
+        preflight = False
+        requested_headers = None
+        for key, value in scope["headers"]:
+            if key == b"origin":
+                origin = value
+            elif key == b"access-control-request-method":
+                preflight = True
+            elif key == b"access-control-request-headers":
+                requested_headers = value
+        if origin is None:
+            # Not a cross-origin browser request
+            await self.app(scope, receive, send)
+            return
+        cors_headers = [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+        if preflight and scope["method"] == "OPTIONS":
+            headers = cors_headers + [
+                (b"access-control-allow-methods", ALL_METHODS),
+                (b"access-control-max-age", b"600"),
+            ]
+            if requested_headers is not None:
+                headers.append((b"access-control-allow-headers", requested_headers))
+            await send({"type": "http.response.start", "status": 204, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", ()), *cors_headers]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
@@ -0,0 +1,54 @@
+import numba
+import numpy as np
+
+MARKET = 0
+LIMIT = 1
+
+@numba.njit(cache=True)
+def _fill_price(i, close, openp, order_type_code):
+    if order_type_code == MARKET or i + 1 >= len(close):
+        return close[i]
+    return openp[i + 1]
+
+@numba.njit(cache=True)
+def _simulate(close, openp, ent, exi, order_type_code):
+    """
+    Bar-by-bar position state machine compiled to native code.
+    Holds at most one position at a time: an exit is only taken while in a
+    position and an entry only while flat. A trailing entry without an exit
+    stays open.
+    Returns:
+        Tuple of entry_idx, exit_idx, entry_px and exit_px arrays.
+    """
+    n = len(close)
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    entry_px = np.empty(n, dtype=np.float64)
+    exit_px = np.empty(n, dtype=np.float64)
+    n_entries = 0
+    n_exits = 0
+    in_position = False
+    for i in range(n):
+        if not in_position and ent[i]:
+            in_position = True
+            entry_idx[n_entries] = i
+            entry_px[n_entries] = _fill_price(i, close, openp, order_type_code)
+            n_entries += 1
+        elif in_position and exi[i]:
+            exit_idx[n_exits] = i
+            exit_px[n_exits] = _fill_price(i, close, openp, order_type_code)
+            n_exits += 1
+            in_position = False
+    return (
+        entry_idx[:n_entries], exit_idx[:n_exits],
+        entry_px[:n_entries], exit_px[:n_exits]
+    )
+
+# Compile eagerly (or load from the on-disk cache) so the first request doesn't pay for it;
+# float32 is the dtype of loaded OHLCV data, float64 that of ad-hoc DataFrames
+for _dtype in (np.float32, np.float64):
+    _simulate(
+        np.ones(2, dtype=_dtype), np.ones(2, dtype=_dtype),
+        np.array([True, False]), np.array([False, True]),
+        MARKET
+    )
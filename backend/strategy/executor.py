@@ -1,14 +1,23 @@
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
-from .metrics import (
-    calculate_cagr, calculate_sharpe, calculate_sortino, calculate_calmar,
-    calculate_max_drawdown, calculate_volatility, calculate_var, calculate_beta
-)
+from typing import List, Dict, Any, Union
+from ._executor_numba import MARKET, LIMIT, _simulate
+from .ohlcv_arrays import OHLCVArrays
+from .metrics import calculate_all_metrics, calculate_beta
+
+def _fill_prices(px: np.ndarray, price_dtype: np.dtype) -> np.ndarray:
+    """
+    Fill prices as float64. float32 prices are widened through their shortest repr,
+    so a stored 1.9 is reported (and traded) as 1.9 rather than 1.899999976158142.
+    """
+    if price_dtype == np.float32:
+        return px.astype(np.float32).astype(str).astype(np.float64)
+    return px
 
 def execute_strategy(
-    df: pd.DataFrame,
-    entry_signal: pd.Series,
-    exit_signal: pd.Series,
+    df: Union[pd.DataFrame, OHLCVArrays],
+    entry_signal: Union[pd.Series, np.ndarray],
+    exit_signal: Union[pd.Series, np.ndarray],
     order_type: str = 'market',
     initial_balance: float = 10000.0,
     position_size: float = 1.0,
@@ -17,75 +26,65 @@ def execute_strategy(
     """
     Simulate order execution and track portfolio performance.
     Args:
-        df (pd.DataFrame): DataFrame with price and indicators.
-        entry_signal (pd.Series): Boolean Series for entry points.
-        exit_signal (pd.Series): Boolean Series for exit points.
+        df (pd.DataFrame | OHLCVArrays): DataFrame with price and indicators, or the raw OHLCV arrays.
+        entry_signal (pd.Series | np.ndarray): Boolean Series for entry points.
+        exit_signal (pd.Series | np.ndarray): Boolean Series for exit points.
         order_type (str): 'market' or 'limit'.
         initial_balance (float): Starting portfolio balance.
         position_size (float): Number of units per trade.
     Returns:
         Dict[str, Any]: Trade list and performance summary.
     """
+    # Kept in their stored dtype (float32 for loaded data) so the kernel reads the column views directly
+    close = np.asarray(df['close'])
+    openp = np.asarray(df['open'])
+    ent = np.asarray(entry_signal, dtype=bool)
+    exi = np.asarray(exit_signal, dtype=bool)
+    order_type_code = MARKET if order_type == 'market' else LIMIT
+    entry_idx, exit_idx, entry_px, exit_px = _simulate(close, openp, ent, exi, order_type_code)
+    # O(trades): PnL and balances are computed in float64 from the decimal fill prices
+    entry_px = _fill_prices(entry_px, close.dtype)
+    exit_px = _fill_prices(exit_px, close.dtype)
+    pnl = (exit_px - entry_px[:len(exit_px)]) * float(position_size)
+    balances = initial_balance + np.cumsum(pnl)
+    balance = balances[-1] if len(balances) else initial_balance
+    # Realised balance per bar: each balance holds from its exit bar until the next exit
+    segment_lengths = np.diff(np.concatenate(([0], exit_idx, [len(close)])))
+    equity_curve = np.repeat(np.concatenate(([initial_balance], balances)), segment_lengths)
+    # Assemble trade records, O(trades) rather than O(bars)
+    timestamps = np.asarray(df['timestamp'])
+    entry_times = pd.DatetimeIndex(timestamps[entry_idx]).tolist()
+    exit_times = pd.DatetimeIndex(timestamps[exit_idx]).tolist()
+    # zip over plain lists instead of indexing numpy scalars once per field per trade
+    exits = zip(exit_px.tolist(), exit_times, pnl.tolist(), balances.tolist())
     trades = []
-    in_position = False
-    entry_price = 0.0
-    balance = initial_balance
-    equity_curve = []
-    max_equity = initial_balance
-    drawdown = 0.0
-    entry_time = None
-    for i in range(len(df)):
-        price = df['close'].iloc[i]
-        if not in_position and entry_signal.iloc[i]:
-            in_position = True
-            entry_price = price if order_type == 'market' else df['open'].iloc[i+1] if i+1 < len(df) else price
-            entry_time = df['timestamp'].iloc[i]
-            trades.append({'type': 'entry', 'price': entry_price, 'timestamp': entry_time})
-        elif in_position and exit_signal.iloc[i]:
-            exit_price = price if order_type == 'market' else df['open'].iloc[i+1] if i+1 < len(df) else price
-            pnl = (exit_price - entry_price) * position_size
-            balance += pnl
-            exit_time = df['timestamp'].iloc[i]
+    for entry_price, entry_time in zip(entry_px.tolist(), entry_times):
+        trades.append({'type': 'entry', 'price': entry_price, 'timestamp': entry_time})
+        exit_trade = next(exits, None)
+        if exit_trade is not None:
+            exit_price, exit_time, trade_pnl, exit_balance = exit_trade
             trades.append({
                 'type': 'exit',
                 'price': exit_price,
                 'timestamp': exit_time,
-                'pnl': pnl,
-                'balance': balance
+                'pnl': trade_pnl,
+                'balance': exit_balance
             })
-            in_position = False
-            entry_time = None
-        equity_curve.append(balance)
-        max_equity = max(max_equity, balance)
-        drawdown = max(drawdown, (max_equity - balance))
-    # Build portfolio value and returns series
-    portfolio_values = pd.Series(equity_curve, index=df.index)
-    returns = portfolio_values.pct_change().dropna()
+    # Per-bar returns of the equity curve (pct_change without the leading NaN)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = equity_curve[1:] / equity_curve[:-1] - 1
     # Metrics
-    max_dd = calculate_max_drawdown(portfolio_values)
-    cagr = calculate_cagr(portfolio_values)
-    sharpe = calculate_sharpe(returns)
-    sortino = calculate_sortino(returns)
-    calmar = calculate_calmar(portfolio_values)
-    volatility = calculate_volatility(returns)
-    var = calculate_var(returns)
+    metrics = calculate_all_metrics(returns, equity_curve)
     beta = calculate_beta(returns, benchmark_returns) if benchmark_returns is not None else None
     # Trade stats
-    total_trades = len([t for t in trades if t['type'] == 'exit'])
+    total_trades = len(exit_idx)
     total_pnl = balance - initial_balance
-    win_rate = (sum(1 for t in trades if t.get('pnl', 0) > 0 and t['type'] == 'exit') / total_trades * 100) if total_trades else 0.0
+    win_rate = (np.count_nonzero(pnl > 0) / total_trades * 100) if total_trades else 0.0
     summary = {
         'total_trades': total_trades,
         'total_pnl': total_pnl,
         'win_rate': win_rate,
-        'max_drawdown_$': max_dd['max_drawdown_$'],
-        'max_drawdown_pct': max_dd['max_drawdown_pct'],
-        'CAGR': cagr,
-        'Sharpe': sharpe,
-        'Sortino': sortino,
-        'Calmar': calmar,
-        'Volatility': volatility,
-        'VaR_95': var,
+        **metrics,
         'Beta': beta,
         'final_balance': balance
     }
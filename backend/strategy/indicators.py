@@ -1,29 +1,95 @@
+import numba
+import numpy as np
 import pandas as pd
+from typing import Tuple
+
+@numba.njit(cache=True)
+def _ewm_step(weighted, old_wt, x, alpha):
+    """
+    One step of ewm(adjust=False).mean(), NaN handling included: seeds on the
+    first finite value, carries the average over NaNs while decaying its weight.
+    """
+    if weighted != weighted:
+        if x == x:
+            return x, 1.0
+        return weighted, old_wt
+    old_wt *= 1 - alpha
+    if x == x:
+        if weighted != x:
+            weighted = (old_wt * weighted + alpha * x) / (old_wt + alpha)
+        old_wt = 1.0
+    return weighted, old_wt
+
+@numba.njit(cache=True)
+def _macd(price, af, as_, asig):
+    """
+    Fast EMA, slow EMA and signal EMA in a single pass over price
+    (recursive form, equivalent to ewm(adjust=False)).
+    """
+    n = len(price)
+    out_macd = np.empty(n, dtype=np.float64)
+    out_sig = np.empty(n, dtype=np.float64)
+    ef = es = sig = np.nan
+    wf = ws = wsig = 1.0
+    for i in range(n):
+        ef, wf = _ewm_step(ef, wf, price[i], af)
+        es, ws = _ewm_step(es, ws, price[i], as_)
+        m = ef - es
+        sig, wsig = _ewm_step(sig, wsig, m, asig)
+        out_macd[i] = m
+        out_sig[i] = sig
+    return out_macd, out_sig
+
+def ema(price: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Exponential Moving Average of a price array.
+    """
+    return pd.Series(price).ewm(span=period, adjust=False).mean().to_numpy()
+
+def rsi(price: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index of a price array, using Wilder's smoothing.
+    """
+    price = np.asarray(price, dtype=np.float64)
+    delta = np.empty_like(price)
+    # No change is observed at the first bar; NaN keeps it out of the warm-up count
+    delta[:1] = np.nan
+    np.subtract(price[1:], price[:-1], out=delta[1:])
+    gain = np.maximum(delta, 0.0)
+    loss = np.maximum(-delta, 0.0)
+    # Wilder's smoothing is an EMA with alpha = 1 / period
+    avg_gain = pd.Series(gain).ewm(alpha=1 / period, min_periods=period, adjust=False).mean().to_numpy()
+    avg_loss = pd.Series(loss).ewm(alpha=1 / period, min_periods=period, adjust=False).mean().to_numpy()
+    rs = np.divide(avg_gain, avg_loss, out=np.full_like(avg_gain, np.nan), where=avg_loss != 0)
+    # Only gains and no losses is RSI 100; a flat window (0/0) stays NaN
+    rs[(avg_loss == 0) & (avg_gain > 0)] = np.inf
+    return 100 - (100 / (1 + rs))
+
+def macd(price: np.ndarray, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    MACD and signal line of a price array.
+    """
+    price = np.asarray(price, dtype=np.float64)
+    return _macd(price, 2 / (fast_period + 1), 2 / (slow_period + 1), 2 / (signal_period + 1))
 
 def add_ema(df: pd.DataFrame, period: int = 14, price_col: str = 'close', out_col: str = 'ema') -> pd.DataFrame:
     """
     Adds an Exponential Moving Average (EMA) column to the DataFrame.
     """
-    df[out_col] = df[price_col].ewm(span=period, adjust=False).mean()
+    df[out_col] = ema(df[price_col].to_numpy(), period)
     return df
 
 def add_rsi(df: pd.DataFrame, period: int = 14, price_col: str = 'close', out_col: str = 'rsi') -> pd.DataFrame:
     """
-    Adds a Relative Strength Index (RSI) column to the DataFrame.
+    Adds a Relative Strength Index (RSI) column to the DataFrame, using Wilder's smoothing.
     """
-    delta = df[price_col].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    df[out_col] = 100 - (100 / (1 + rs))
+    df[out_col] = rsi(df[price_col].to_numpy(), period)
     return df
 
 def add_macd(df: pd.DataFrame, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9, price_col: str = 'close', macd_col: str = 'macd', signal_col: str = 'macd_signal') -> pd.DataFrame:
     """
     Adds MACD and signal line columns to the DataFrame.
     """
-    ema_fast = df[price_col].ewm(span=fast_period, adjust=False).mean()
-    ema_slow = df[price_col].ewm(span=slow_period, adjust=False).mean()
-    df[macd_col] = ema_fast - ema_slow
-    df[signal_col] = df[macd_col].ewm(span=signal_period, adjust=False).mean()
+    macd_line, signal = macd(df[price_col].to_numpy(), fast_period, slow_period, signal_period)
+    df[[macd_col, signal_col]] = np.column_stack([macd_line, signal])
     return df
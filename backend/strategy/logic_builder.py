@@ -1,7 +1,113 @@
-import pandas as pd
+import ast
+import numexpr as ne
 import numpy as np
+import pandas as pd
 import re
-from typing import List
+from functools import lru_cache
+from numexpr.necompiler import getContext, getExprNames, getType
+from typing import Dict, List, Optional, Tuple
+
+# Logic keywords and condition references; the capturing group keeps them in re.split's output
+_LOGIC_TOKENS = re.compile(r'\b(AND|OR|NOT|COND\d+)\b')
+_OPERATORS = {'AND': '&', 'OR': '|', 'NOT': '~'}
+
+def _build_expression(conditions: Tuple[str, ...], logic: str) -> str:
+    """
+    Inlines each CONDk of the logic string as its parenthesised condition and maps
+    AND/OR/NOT to &/|/~, producing a single boolean expression.
+    """
+    parts = _LOGIC_TOKENS.split(logic.upper())
+    # Odd positions hold the captured tokens, even positions the text between them
+    for i in range(1, len(parts), 2):
+        token = parts[i]
+        if token in _OPERATORS:
+            parts[i] = _OPERATORS[token]
+        else:
+            idx = int(token[4:]) - 1
+            if not 0 <= idx < len(conditions):
+                raise ValueError(f"{token} does not refer to one of the {len(conditions)} conditions")
+            parts[i] = f'({conditions[idx]})'
+    return ''.join(parts)
+
+def _to_numexpr(node: ast.expr) -> str:
+    """
+    Renders a parsed expression as NumExpr source, turning and/or/not and chained
+    comparisons into &/|/~ with explicit parentheses; in NumExpr (as in Python)
+    & and | bind tighter than comparisons, unlike and/or.
+    """
+    if isinstance(node, ast.BoolOp):
+        op = ' & ' if isinstance(node.op, ast.And) else ' | '
+        return op.join(f'({_to_numexpr(value)})' for value in node.values)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.Invert)):
+        return f'~({_to_numexpr(node.operand)})'
+    if isinstance(node, ast.Compare) and any(isinstance(op, (ast.In, ast.NotIn, ast.Is, ast.IsNot)) for op in node.ops):
+        raise ValueError('membership and identity tests are not supported by NumExpr')
+    if isinstance(node, ast.Compare) and len(node.ops) > 1:
+        operands = [node.left, *node.comparators]
+        pairs = (ast.Compare(left=lhs, ops=[op], comparators=[rhs]) for lhs, op, rhs in zip(operands, node.ops, operands[1:]))
+        return ' & '.join(f'({ast.unparse(pair)})' for pair in pairs)
+    return ast.unparse(node)
+
+def _numexpr_source(expression: str) -> str:
+    """
+    Translates a DataFrame.eval-style boolean expression to NumExpr source.
+    Like DataFrame.eval, & and | are read as and/or, i.e. looser than comparisons.
+    """
+    tree = ast.parse(expression.replace('&', ' and ').replace('|', ' or '), mode='eval')
+    return _to_numexpr(tree.body)
+
+class CompiledLogic:
+    """
+    A strategy logic expression parsed once and compiled to a NumExpr program.
+    Calling it on a DataFrame only gathers the referenced columns and runs the
+    program; a program is compiled per distinct set of column dtypes.
+    Expressions NumExpr can't handle (e.g. 'rsi_14 in [1, 2]', comparisons on
+    timestamp or string columns, or the index) are evaluated with DataFrame.eval
+    instead, as before.
+    """
+    def __init__(self, expression: str):
+        self.expression = expression
+        try:
+            self.source = _numexpr_source(expression)
+            self.names, _ = getExprNames(self.source, getContext({}))
+        except Exception:
+            # Not expressible in NumExpr; __call__ falls back to DataFrame.eval
+            self.source = None
+            self.names = []
+        # None marks a signature NumExpr failed to compile, so it isn't retried
+        self._programs: Dict[tuple, Optional[ne.NumExpr]] = {}
+
+    def __call__(self, df: pd.DataFrame) -> pd.Series:
+        if self.source is None:
+            return df.eval(self.expression)
+        try:
+            arrays = [df[name].to_numpy() for name in self.names]
+            signature = tuple((name, getType(arr)) for name, arr in zip(self.names, arrays))
+        except (KeyError, ValueError):
+            # Not a column (e.g. 'index'), or a dtype NumExpr has no type for (datetime, object)
+            return df.eval(self.expression)
+        if signature not in self._programs:
+            try:
+                self._programs[signature] = ne.NumExpr(self.source, signature=list(signature))
+            except Exception:
+                # e.g. an operator NumExpr doesn't support for these column dtypes
+                self._programs[signature] = None
+        program = self._programs[signature]
+        if program is None:
+            return df.eval(self.expression)
+        return pd.Series(np.asarray(program(*arrays), dtype=bool), index=df.index)
+
+@lru_cache(maxsize=256)
+def compile_logic(conditions: Tuple[str, ...], logic: str) -> CompiledLogic:
+    """
+    Compiles a tuple of conditions and a logic string into a reusable callable.
+    Args:
+        conditions (Tuple[str, ...]): Condition strings, e.g., ('EMA_20 > EMA_50', 'RSI_14 < 30')
+        logic (str): Logic string using COND1, COND2, etc., e.g., 'COND1 AND COND2'
+    Returns:
+        CompiledLogic: Callable mapping a DataFrame to a boolean Series.
+    """
+    return CompiledLogic(_build_expression(conditions, logic))
 
 def evaluate_logic(df: pd.DataFrame, conditions: List[str], logic: str) -> pd.Series:
     """
@@ -13,17 +119,4 @@ def evaluate_logic(df: pd.DataFrame, conditions: List[str], logic: str) -> pd.Se
     Returns:
         pd.Series: Boolean Series where the logic is True.
     """
-    cond_results = {}
-    for idx, cond in enumerate(conditions):
-        cond_name = f'COND{idx+1}'
-        # Use pandas.eval for safe evaluation
-        cond_results[cond_name] = df.eval(cond)
-    # Replace logic string with numpy logical operators
-    logic_eval = logic.upper()
-    logic_eval = re.sub(r'AND', '&', logic_eval)
-    logic_eval = re.sub(r'OR', '|', logic_eval)
-    logic_eval = re.sub(r'NOT', '~', logic_eval)
-    # Build the final boolean Series
-    local_dict = cond_results.copy()
-    result = eval(logic_eval, {"__builtins__": None, "np": np}, local_dict)
-    return result
+    return compile_logic(tuple(conditions), logic)(df)
@@ -1,13 +1,15 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 from datetime import datetime
+import numba
 import pandas as pd
 import numpy as np
 
-def calculate_cagr(portfolio_values: pd.Series, periods_per_year: int = 252) -> float:
+def calculate_cagr(portfolio_values: Union[pd.Series, np.ndarray], periods_per_year: int = 252) -> float:
     if len(portfolio_values) < 2:
         return 0.0
-    start = portfolio_values.iloc[0]
-    end = portfolio_values.iloc[-1]
+    values = np.asarray(portfolio_values)
+    start = values[0]
+    end = values[-1]
     n_years = len(portfolio_values) / periods_per_year
     if start <= 0 or n_years <= 0:
         return 0.0
@@ -40,12 +42,14 @@ def calculate_calmar(portfolio_values: pd.Series, periods_per_year: int = 252) -
     calmar = cagr / abs(drawdown)
     return calmar
 
-def calculate_max_drawdown(portfolio_values: pd.Series) -> Dict[str, float]:
-    running_max = portfolio_values.cummax()
-    drawdowns = running_max - portfolio_values
-    drawdown_pct = drawdowns / running_max * 100
+def calculate_max_drawdown(portfolio_values: Union[pd.Series, np.ndarray]) -> Dict[str, float]:
+    values = np.asarray(portfolio_values, dtype=np.float64)
+    if len(values) == 0:
+        return {'max_drawdown_$': np.nan, 'max_drawdown_pct': np.nan}
+    running_max = np.maximum.accumulate(values)
+    drawdowns = running_max - values
     max_dd = drawdowns.max()
-    max_dd_pct = drawdown_pct.max()
+    max_dd_pct = (drawdowns / running_max * 100).max()
     return {'max_drawdown_$': max_dd, 'max_drawdown_pct': max_dd_pct}
 
 def calculate_volatility(returns: pd.Series, periods_per_year: int = 252) -> float:
@@ -68,3 +72,68 @@ def calculate_beta(strategy_returns: pd.Series, benchmark_returns: pd.Series) ->
     if var_bench == 0:
         return 0.0
     return cov / var_bench
+
+@numba.njit(cache=True)
+def _returns_pass(returns):
+    """
+    Single pass over returns (NaNs skipped) accumulating count, mean and sum of
+    squared deviations for all returns and for the negative ones (Welford).
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    dn = 0
+    dmean = 0.0
+    dm2 = 0.0
+    for x in returns:
+        if x != x:
+            continue
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+        if x < 0:
+            dn += 1
+            ddelta = x - dmean
+            dmean += ddelta / dn
+            dm2 += ddelta * (x - dmean)
+    return n, mean, m2, dn, dm2
+
+def calculate_all_metrics(
+    returns: Union[pd.Series, np.ndarray],
+    portfolio_values: Union[pd.Series, np.ndarray],
+    risk_free_rate: float = 0.0,
+    periods_per_year: int = 252,
+    confidence: float = 0.05
+) -> Dict[str, float]:
+    """
+    Computes the summary metrics in one pass over returns instead of one pass per metric.
+    Matches the individual calculate_* functions (sample std, NaNs dropped).
+    Returns:
+        Dict[str, float]: max_drawdown_$, max_drawdown_pct, CAGR, Sharpe, Sortino, Calmar, Volatility, VaR_95.
+    """
+    r = np.asarray(returns, dtype=np.float64)
+    n, mean, m2, dn, dm2 = _returns_pass(r)
+    std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+    downside_std = np.sqrt(dm2 / (dn - 1)) if dn > 1 else np.nan
+    excess_mean = (mean if n else np.nan) - risk_free_rate / periods_per_year
+    sqrt_periods = np.sqrt(periods_per_year)
+    sharpe = 0.0 if std == 0 else excess_mean / std * sqrt_periods
+    sortino = 0.0 if downside_std == 0 else excess_mean / downside_std * sqrt_periods
+    volatility = std * sqrt_periods * 100
+    var = abs(np.nanquantile(r, confidence)) * 100 if n else np.nan
+    max_dd = calculate_max_drawdown(portfolio_values)
+    cagr = calculate_cagr(portfolio_values, periods_per_year)
+    # Deepest fractional drawdown, as calculate_calmar uses
+    drawdown = max_dd['max_drawdown_pct'] / 100
+    calmar = 0.0 if drawdown == 0 else (cagr / 100) / abs(drawdown)
+    return {
+        'max_drawdown_$': max_dd['max_drawdown_$'],
+        'max_drawdown_pct': max_dd['max_drawdown_pct'],
+        'CAGR': cagr,
+        'Sharpe': sharpe,
+        'Sortino': sortino,
+        'Calmar': calmar,
+        'Volatility': volatility,
+        'VaR_95': var,
+    }
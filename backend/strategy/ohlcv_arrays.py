@@ -0,0 +1,45 @@
+from dataclasses import dataclass, fields
+import numpy as np
+import pandas as pd
+
+@dataclass(frozen=True)
+class OHLCVArrays:
+    """
+    Struct-of-arrays view of OHLCV data for the indicator and executor hot paths.
+    Each column is a plain 1-D numpy array, so kernels never go through pandas'
+    block manager or repeated .to_numpy() conversions.
+    """
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'OHLCVArrays':
+        """
+        Builds the arrays from a DataFrame with timestamp and lowercase OHLCV columns.
+        Columns keep the DataFrame's dtype (float32 for loaded data).
+        """
+        return cls(
+            timestamp=df['timestamp'].to_numpy(),
+            open=df['open'].to_numpy(),
+            high=df['high'].to_numpy(),
+            low=df['low'].to_numpy(),
+            close=df['close'].to_numpy(),
+            volume=df['volume'].to_numpy(),
+        )
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def __contains__(self, col: str) -> bool:
+        return col in _COLUMNS
+
+    def __getitem__(self, col: str) -> np.ndarray:
+        if col not in _COLUMNS:
+            raise KeyError(col)
+        return getattr(self, col)
+
+_COLUMNS = frozenset(f.name for f in fields(OHLCVArrays))